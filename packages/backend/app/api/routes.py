@@ -3,12 +3,16 @@
 from __future__ import annotations
 
 import asyncio
+import concurrent.futures
+import json
+import subprocess
 import tempfile
+import time
 import uuid
 from pathlib import Path
+from typing import BinaryIO
 
-import aiofiles
-import librosa  # type: ignore[import-untyped]
+import soundfile as sf  # type: ignore[import-untyped]
 from fastapi import APIRouter, File, HTTPException, UploadFile
 from pydantic import BaseModel
 
@@ -32,6 +36,18 @@ _cancellation_events: dict[str, asyncio.Event] = {}
 # Max file size: 100MB
 MAX_FILE_SIZE = 100 * 1024 * 1024
 
+# Accepted upload content types (MP3, WAV, M4A)
+_ALLOWED_TYPES = frozenset(
+    {
+        "audio/mpeg",
+        "audio/mp3",
+        "audio/wav",
+        "audio/x-wav",
+        "audio/mp4",
+        "audio/m4a",
+    }
+)
+
 
 class ProcessResponse(BaseModel):
     """Response for processing request."""
@@ -75,32 +91,25 @@ async def process_audio(
         raise HTTPException(status_code=500, detail="Processor not initialized")
 
     # Validate file type
-    if file.content_type not in [
-        "audio/mpeg",
-        "audio/mp3",
-        "audio/wav",
-        "audio/x-wav",
-        "audio/mp4",
-        "audio/m4a",
-    ]:
+    if file.content_type not in _ALLOWED_TYPES:
         raise HTTPException(
             status_code=400,
             detail=f"Unsupported file type: {file.content_type}",
         )
 
-    # Read file content
-    content = await file.read()
-
-    # Validate file size (security: prevent DoS via large uploads)
-    if len(content) > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=413,
-            detail=f"File too large. Max size: {MAX_FILE_SIZE // (1024 * 1024)}MB",
-        )
+    # Reject obviously oversized uploads from the declared Content-Length
+    # before reading a single byte (the streamed write still enforces the
+    # limit for clients that lie or omit the header)
+    content_length = file.headers.get("content-length")
+    if content_length is not None and content_length.isdigit():
+        if int(content_length) > MAX_FILE_SIZE:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File too large. Max size: {MAX_FILE_SIZE // (1024 * 1024)}MB",
+            )
 
     # Generate client ID for WebSocket connection
     client_id = str(uuid.uuid4())
-    logger.info(f"Upload received: {file.filename} ({len(content)} bytes) → {client_id}")
 
     # SECURITY FIX: Sanitize filename to prevent path traversal attacks (CWE-22)
     # Extract only the filename component and extension, discarding any path
@@ -114,12 +123,26 @@ async def process_audio(
     temp_dir.mkdir(parents=True, exist_ok=True)
     temp_path = temp_dir / sanitized_name
 
-    logger.debug(f"Sanitized filename: {file.filename} → {sanitized_name}")
+    logger.debug("Sanitized filename: %s → %s", file.filename, sanitized_name)
 
     try:
-        # Save upload (async to avoid blocking event loop)
-        async with aiofiles.open(temp_path, "wb") as f:
-            await f.write(content)
+        # Copy the spooled upload to disk in a single executor hop.
+        # UploadFile.file is already a SpooledTemporaryFile, so one blocking
+        # copy replaces a threadpool round-trip per chunk while still keeping
+        # peak memory at one chunk and enforcing the size limit inline.
+        await file.seek(0)
+        try:
+            total = await asyncio.to_thread(
+                _save_upload, file.file, temp_path, MAX_FILE_SIZE
+            )
+        except ValueError as size_error:
+            temp_path.unlink(missing_ok=True)
+            raise HTTPException(
+                status_code=413,
+                detail=f"File too large. Max size: {MAX_FILE_SIZE // (1024 * 1024)}MB",
+            ) from size_error
+
+        logger.info("Upload received: %s (%d bytes) → %s", file.filename, total, client_id)
 
         # FIXED M2: Validate file is actual audio (content-type can be spoofed)
         # Run quick librosa check in executor to avoid blocking
@@ -138,22 +161,20 @@ async def process_audio(
         cancellation_event = asyncio.Event()
         _cancellation_events[client_id] = cancellation_event
 
-        # Process in background task and track it
+        # Process in background task and track it. The task is named after
+        # the client so the shared done-callback can find its cancellation
+        # event without allocating a closure per upload.
         task = asyncio.create_task(
             _process_with_progress(
                 processor,
                 temp_path,
                 client_id,
                 cancellation_event,
-            )
+            ),
+            name=client_id,
         )
         _processing_tasks.add(task)
-
-        def cleanup_task(t: asyncio.Task) -> None:
-            _processing_tasks.discard(t)
-            _cancellation_events.pop(client_id, None)
-
-        task.add_done_callback(cleanup_task)
+        task.add_done_callback(_cleanup_task)
 
         return ProcessResponse(
             client_id=client_id,
@@ -170,6 +191,16 @@ async def process_audio(
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+def _cleanup_task(task: asyncio.Task) -> None:
+    """Drop a finished processing task and its cancellation event.
+
+    Shared across all uploads; the owning client_id is the task name, so no
+    per-request closure is needed.
+    """
+    _processing_tasks.discard(task)
+    _cancellation_events.pop(task.get_name(), None)
+
+
 @router.post("/cancel/{client_id}")
 async def cancel_processing(client_id: str) -> dict[str, str]:
     """Cancel ongoing stem processing.
@@ -193,7 +224,7 @@ async def cancel_processing(client_id: str) -> dict[str, str]:
         )
 
     # Signal cancellation
-    logger.info(f"Cancellation requested: {client_id}")
+    logger.info("Cancellation requested: %s", client_id)
     event.set()
 
     return {
@@ -247,10 +278,29 @@ async def _process_with_progress(
     # FIXED: Get event loop for thread-safe task scheduling
     loop = asyncio.get_running_loop()
 
+    # Coalesce progress sends: Demucs can tick many times per second, and
+    # every tick would otherwise schedule a coroutine on the event loop.
+    # Cap at ~10 updates/s per client and skip if the previous send hasn't
+    # completed yet; terminal (100%) updates always go through.
+    last_sent_at = 0.0
+    last_status: str | None = None
+    pending: concurrent.futures.Future | None = None
+
     def progress_callback(progress: float, status: str) -> None:
         """Send progress update via WebSocket (sync callback for executor thread)."""
+        nonlocal last_sent_at, last_status, pending
+
+        now = time.monotonic()
+        if progress < 100.0:
+            if now - last_sent_at < 0.1 and status == last_status:
+                return
+            if pending is not None and not pending.done():
+                return
+
+        last_sent_at = now
+        last_status = status
         # FIXED: Use run_coroutine_threadsafe for safety when called from thread pool
-        asyncio.run_coroutine_threadsafe(
+        pending = asyncio.run_coroutine_threadsafe(
             manager.send_progress(
                 client_id,
                 progress,
@@ -298,22 +348,78 @@ async def _process_with_progress(
             audio_path.unlink()
 
 
+def _save_upload(src: BinaryIO, dst: Path, max_size: int) -> int:
+    """Copy an upload stream to disk, enforcing the size limit inline.
+
+    Runs in a worker thread; a single blocking copy avoids the per-chunk
+    executor dispatch that aiofiles would incur.
+
+    Args:
+        src: Source file object (FastAPI's spooled upload file)
+        dst: Destination path
+        max_size: Maximum allowed size in bytes
+
+    Returns:
+        Total bytes written
+
+    Raises:
+        ValueError: If the upload exceeds max_size
+    """
+    total = 0
+    with open(dst, "wb", buffering=1 << 20) as out:
+        while chunk := src.read(1 << 20):
+            total += len(chunk)
+            if total > max_size:
+                msg = f"Upload exceeds size limit ({max_size} bytes)"
+                raise ValueError(msg)
+            out.write(chunk)
+    return total
+
+
 def _validate_audio_file(path: Path) -> None:
-    """Validate that file is loadable as audio.
+    """Validate that file is real audio by reading only its header.
 
     FIXED M2: Prevents server crashes from malformed files.
-    Content-type header can be spoofed, so we verify with librosa.
+    Content-type header can be spoofed, so we verify the container itself.
+    A header read is orders of magnitude cheaper than decoding PCM, so the
+    executor thread is freed almost immediately.
 
     Args:
         path: Path to audio file
 
     Raises:
-        Exception: If file cannot be loaded as audio
+        ValueError: If file cannot be recognized as audio
     """
     try:
-        # Try loading first few seconds to validate format
-        # duration=1 loads only 1 second for quick validation
-        librosa.load(str(path), duration=1.0, sr=None)
+        # libsndfile reads samplerate/channels/frames from the header
+        # without decoding any audio (WAV, FLAC, OGG, ...)
+        sf.info(str(path))
+        return
+    except Exception:
+        # Not a libsndfile container; fall through to ffprobe for MP3/M4A
+        pass
+
+    try:
+        result = subprocess.run(  # noqa: S603
+            [
+                "ffprobe",
+                "-v",
+                "error",
+                "-show_streams",
+                "-of",
+                "json",
+                str(path),
+            ],
+            capture_output=True,
+            timeout=2,
+            check=True,
+        )
+        streams = json.loads(result.stdout).get("streams", [])
+        if not any(stream.get("codec_type") == "audio" for stream in streams):
+            msg = "File contains no audio streams"
+            raise ValueError(msg)
+    except ValueError:
+        raise
     except Exception as e:
         msg = f"File is not valid audio or format not supported: {e}"
         raise ValueError(msg) from e
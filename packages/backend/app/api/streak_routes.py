@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import time
 from datetime import UTC, date, datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlmodel import Session, select
 
 from app.database import get_session
@@ -18,10 +21,44 @@ from app.models import (
     StreakCreate,
     StreakUpdate,
 )
+from app.models.session import utc_now
+from app.models.streak import SONGS_MERGE
 
 router = APIRouter()
 
 
+# === Response cache ===
+#
+# Achievements and historical streaks change rarely but are fetched on every
+# dashboard load. Cache the serialized response bytes in-process for a short
+# TTL so cache hits skip the query, ORM hydration, and JSON encoding
+# entirely. Write endpoints invalidate their namespace on success.
+
+_CACHE_TTL_SECONDS = 30.0
+
+# (namespace, *params) -> (expires_at, body_bytes)
+_response_cache: dict[tuple[str, ...], tuple[float, bytes]] = {}
+
+
+def _cache_lookup(key: tuple[str, ...]) -> bytes | None:
+    """Return cached body bytes for key if still fresh."""
+    entry = _response_cache.get(key)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def _cache_store(key: tuple[str, ...], body: bytes) -> None:
+    """Cache serialized response bytes under key."""
+    _response_cache[key] = (time.monotonic() + _CACHE_TTL_SECONDS, body)
+
+
+def _cache_invalidate(namespace: str) -> None:
+    """Drop all cached responses in a namespace (after a write)."""
+    for key in [k for k in _response_cache if k[0] == namespace]:
+        del _response_cache[key]
+
+
 # === Session Endpoints ===
 
 
@@ -42,6 +79,48 @@ def create_session(
     return db_session
 
 
+# SQLite compound-INSERT parameter limits make very large batches fragile;
+# chunk anything bigger than this into multiple executemany calls
+_BULK_INSERT_CHUNK = 500
+
+
+@router.post("/sessions/bulk", status_code=201)
+def create_sessions_bulk(
+    *,
+    sessions: list[SessionCreate],
+    db: Annotated[Session, Depends(get_session)],
+) -> dict[str, int]:
+    """Record a batch of practice sessions in one transaction.
+
+    One fsync for the whole batch instead of one per row; intended for
+    end-of-practice flushes from the client.
+    """
+    if not sessions:
+        return {"created": 0}
+
+    # Normalize mappings so every row has the same keys (required for a
+    # single executemany) and apply the started_at default up front
+    now = utc_now()
+    mappings = []
+    for session_data in sessions:
+        data = session_data.model_dump()
+        if data.get("started_at") is None:
+            data["started_at"] = now
+        mappings.append(data)
+
+    try:
+        for i in range(0, len(mappings), _BULK_INSERT_CHUNK):
+            db.bulk_insert_mappings(
+                PracticeSession, mappings[i : i + _BULK_INSERT_CHUNK]
+            )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return {"created": len(mappings)}
+
+
 @router.get("/sessions", response_model=list[PracticeSession])
 def list_sessions(
     *,
@@ -70,8 +149,13 @@ def list_streaks(
     db: Annotated[Session, Depends(get_session)],
     since: date | None = None,
     limit: int = 365,
-) -> list[Streak]:
+) -> Response:
     """List streak records with optional date filter."""
+    cache_key = ("streaks", str(since), str(limit))
+    cached = _cache_lookup(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
     query = select(Streak).order_by(Streak.date.desc())
 
     if since is not None:
@@ -80,7 +164,9 @@ def list_streaks(
     query = query.limit(limit)
 
     streaks = db.exec(query).all()
-    return list(streaks)
+    body = orjson.dumps([s.model_dump(mode="json") for s in streaks])
+    _cache_store(cache_key, body)
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/streaks/{streak_date}", response_model=Streak)
@@ -97,6 +183,7 @@ def get_streak(
         db.add(streak)
         db.commit()
         db.refresh(streak)
+        _cache_invalidate("streaks")
     return streak
 
 
@@ -110,6 +197,8 @@ def update_streak(
     """Update or create streak record for a specific date.
 
     FIXED: Added validation and atomic update to prevent race conditions.
+    The whole read-merge-write is a single UPSERT with RETURNING, so there
+    is no race window and only one round trip per PATCH.
     """
     # Input validation
     if streak_update.practice_time_seconds is not None:
@@ -119,42 +208,30 @@ def update_streak(
                 detail="practice_time_seconds must be non-negative"
             )
 
-    # FIXED: Use BEGIN IMMEDIATE for write intent (prevents other writers)
-    # SQLite WAL mode allows concurrent reads but only one writer
-    db.execute("BEGIN IMMEDIATE")
+    stmt = sqlite_insert(Streak).values(
+        date=streak_date,
+        practice_time_seconds=streak_update.practice_time_seconds or 0,
+        songs_practiced=streak_update.songs_practiced or [],
+        session_count=1,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["date"],
+        set_={
+            "practice_time_seconds": Streak.practice_time_seconds
+            + stmt.excluded.practice_time_seconds,
+            "songs_practiced": SONGS_MERGE,
+            "session_count": Streak.session_count + 1,
+        },
+    ).returning(Streak)
 
     try:
-        # Get existing streak or create new one
-        streak = db.get(Streak, streak_date)
-
-        if not streak:
-            # Create new streak record with initial values
-            streak = Streak(
-                date=streak_date,
-                practice_time_seconds=streak_update.practice_time_seconds or 0,
-                songs_practiced=streak_update.songs_practiced or [],
-                session_count=1,
-            )
-            db.add(streak)
-        else:
-            # Update existing streak (increment rather than replace)
-            if streak_update.practice_time_seconds is not None:
-                streak.practice_time_seconds += streak_update.practice_time_seconds
-
-            if streak_update.songs_practiced is not None:
-                # Merge song lists and deduplicate
-                existing_songs = set(streak.songs_practiced)
-                new_songs = set(streak_update.songs_practiced)
-                streak.songs_practiced = list(existing_songs | new_songs)
-
-            # Increment session count
-            streak.session_count += 1
-
+        streak = db.scalars(stmt).one()
+        # Detach before commit so the RETURNING values survive commit-time
+        # expiry and no refresh SELECT is needed for the response
+        db.expunge(streak)
         db.commit()
-        db.refresh(streak)
-
+        _cache_invalidate("streaks")
         return streak
-
     except Exception:
         db.rollback()
         raise
@@ -167,11 +244,18 @@ def update_streak(
 def list_achievements(
     *,
     db: Annotated[Session, Depends(get_session)],
-) -> list[Achievement]:
+) -> Response:
     """List all unlocked achievements."""
+    cache_key = ("achievements",)
+    cached = _cache_lookup(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
     query = select(Achievement).order_by(Achievement.achieved_at.desc())
     achievements = db.exec(query).all()
-    return list(achievements)
+    body = orjson.dumps([a.model_dump(mode="json") for a in achievements])
+    _cache_store(cache_key, body)
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("/achievements", response_model=Achievement, status_code=201)
@@ -186,8 +270,9 @@ def create_achievement(
     Returns 409 if achievement already exists.
     """
     try:
-        # FIXED: Use BEGIN IMMEDIATE to prevent race condition
-        db.execute("BEGIN IMMEDIATE")
+        # WAL + busy_timeout on the engine plus the UNIQUE constraint on
+        # achievement_type handle write contention; the constraint-violation
+        # fallback below covers the remaining race window
 
         # Check if achievement already exists
         existing = db.exec(
@@ -207,6 +292,7 @@ def create_achievement(
         db.add(achievement)
         db.commit()
         db.refresh(achievement)
+        _cache_invalidate("achievements")
 
         return achievement
 
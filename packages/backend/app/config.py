@@ -0,0 +1,57 @@
+"""Application configuration.
+
+Parses `.env` exactly once and exposes the result as an immutable
+`Settings` object via `get_settings()`. Modules that need configuration
+import the accessor instead of instantiating their own decouple config,
+so the file is read and cast a single time per process.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from decouple import Config as DecoupleConfig
+from decouple import RepositoryEnv
+from decouple import config as _autoconfig
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Resolved application settings."""
+
+    api_base_url: str
+    cache_dir: Path
+    debug: bool
+    log_level: str
+    log_file: Path | None
+    cors_origins: tuple[str, ...]
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Parse configuration once and cache it for the process lifetime."""
+    try:
+        cfg = DecoupleConfig(RepositoryEnv(".env"))
+    except FileNotFoundError:
+        # No .env next to the working directory (e.g. tooling imports);
+        # fall back to decouple's search/os.environ behavior
+        cfg = _autoconfig
+
+    debug = cfg("DEBUG", default=False, cast=bool)
+    log_file = cfg("LOG_FILE", default=None)
+    # FIXED M6: CORS origins configurable via environment variable
+    cors_origins = cfg(
+        "CORS_ORIGINS",
+        default="http://localhost:5173,http://localhost:3000",
+    ).split(",")
+
+    return Settings(
+        api_base_url=cfg("API_BASE_URL", default="http://localhost:8007"),
+        cache_dir=Path(cfg("CACHE_DIR", default="~/.riffroom/stems")).expanduser(),
+        debug=debug,
+        log_level=cfg("LOG_LEVEL", default="DEBUG" if debug else "INFO"),
+        log_file=Path(log_file).expanduser() if log_file else None,
+        cors_origins=tuple(cors_origins),
+    )
@@ -26,9 +26,14 @@ def setup_logging(
         log_file: Optional file path to write logs to
         rich_tracebacks: Enable rich traceback formatting
     """
+    # Capturing locals reprs every variable in every frame on exception —
+    # ruinously slow when multi-GB tensors are in scope — so only do it at
+    # DEBUG level
+    show_locals = level.upper() == "DEBUG"
+
     # Install rich tracebacks for better error display
     if rich_tracebacks:
-        install_rich_traceback(show_locals=True, suppress=[])
+        install_rich_traceback(show_locals=show_locals, suppress=[])
 
     # Create console for rich output
     console = Console(stderr=True)
@@ -42,7 +47,7 @@ def setup_logging(
             RichHandler(
                 console=console,
                 rich_tracebacks=True,
-                tracebacks_show_locals=True,
+                tracebacks_show_locals=show_locals,
                 markup=True,
             )
         ],
@@ -23,6 +23,12 @@ engine = create_engine(
         "timeout": 30,  # 30s timeout for lock waits
     },
     pool_pre_ping=True,  # Verify connections before use
+    # WAL gives concurrency through multiple connections, so keep a pool
+    # large enough for the FastAPI thread workers instead of churning
+    # overflow connections (each of which re-runs the pragma setup)
+    pool_size=20,
+    max_overflow=0,
+    pool_recycle=3600,
 )
 
 
@@ -35,6 +41,9 @@ def set_sqlite_pragma(dbapi_conn, connection_record):
     cursor.execute("PRAGMA busy_timeout=30000")  # 30s timeout for locks
     cursor.execute("PRAGMA synchronous=NORMAL")  # Faster, still safe with WAL
     cursor.execute("PRAGMA foreign_keys=ON")  # Enforce foreign key constraints
+    cursor.execute("PRAGMA temp_store=MEMORY")  # Sorts/temp tables off disk
+    cursor.execute("PRAGMA mmap_size=268435456")  # Memory-map up to 256MB
+    cursor.execute("PRAGMA cache_size=-64000")  # 64MB page cache
     cursor.close()
 
 
@@ -16,6 +16,35 @@ from app.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Content Security Policy
+# Allows self-hosted resources, inline styles (for Tailwind),
+# and WebSocket connections
+_CSP = "; ".join(
+    [
+        "default-src 'self'",
+        "script-src 'self' 'unsafe-inline'",  # unsafe-inline needed for Vite dev
+        "style-src 'self' 'unsafe-inline'",  # unsafe-inline for Tailwind
+        "connect-src 'self' ws: wss:",  # WebSocket support
+        "img-src 'self' data: blob:",  # data URIs for waveform canvas
+        "font-src 'self'",
+        "frame-ancestors 'none'",  # Prevent clickjacking
+        "base-uri 'self'",
+        "form-action 'self'",
+    ]
+)
+
+# All headers are identical on every response, so build them once at
+# import instead of re-joining the CSP list per request
+_STATIC_HEADERS = (
+    ("Content-Security-Policy", _CSP),
+    ("X-Content-Type-Options", "nosniff"),  # Prevent MIME type sniffing
+    ("X-Frame-Options", "DENY"),  # Prevent clickjacking
+    ("X-XSS-Protection", "1; mode=block"),  # Legacy XSS protection
+    ("Referrer-Policy", "strict-origin-when-cross-origin"),
+    # Permissions policy (restrict features)
+    ("Permissions-Policy", "geolocation=(), camera=(), microphone=(), payment=()"),
+)
+
 
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     """Add security headers to all responses."""
@@ -24,40 +53,7 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         """Add security headers to response."""
         response = await call_next(request)
 
-        # Content Security Policy
-        # Allows self-hosted resources, inline styles (for Tailwind),
-        # and WebSocket connections
-        csp_directives = [
-            "default-src 'self'",
-            "script-src 'self' 'unsafe-inline'",  # unsafe-inline needed for Vite dev
-            "style-src 'self' 'unsafe-inline'",  # unsafe-inline for Tailwind
-            "connect-src 'self' ws: wss:",  # WebSocket support
-            "img-src 'self' data: blob:",  # data URIs for waveform canvas
-            "font-src 'self'",
-            "frame-ancestors 'none'",  # Prevent clickjacking
-            "base-uri 'self'",
-            "form-action 'self'",
-        ]
-        response.headers["Content-Security-Policy"] = "; ".join(csp_directives)
-
-        # Prevent MIME type sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
-
-        # Prevent clickjacking
-        response.headers["X-Frame-Options"] = "DENY"
-
-        # XSS protection (legacy, but doesn't hurt)
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-
-        # Referrer policy
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-
-        # Permissions policy (restrict features)
-        response.headers["Permissions-Policy"] = (
-            "geolocation=(), "
-            "camera=(), "
-            "microphone=(), "
-            "payment=()"
-        )
+        for name, value in _STATIC_HEADERS:
+            response.headers[name] = value
 
         return response
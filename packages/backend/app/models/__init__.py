@@ -1,6 +1,7 @@
 """Database models and schemas."""
 
 from .achievement import Achievement, AchievementCreate, AchievementType
+from .loop_analysis import LoopAnalysis
 from .session import Session, SessionCreate, SessionUpdate
 from .song import Song, SongCreate
 from .stem import Stem, StemCreate, StemType
@@ -10,6 +11,7 @@ __all__ = [
     "Achievement",
     "AchievementCreate",
     "AchievementType",
+    "LoopAnalysis",
     "Session",
     "SessionCreate",
     "SessionUpdate",
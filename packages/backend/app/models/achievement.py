@@ -4,9 +4,15 @@ from __future__ import annotations
 
 from datetime import UTC, datetime
 from enum import Enum
+from typing import TYPE_CHECKING
 
+from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlmodel import Field, SQLModel
 
+if TYPE_CHECKING:
+    from sqlmodel import Session as DbSession
+
 
 def utc_now() -> datetime:
     """Get current UTC time as timezone-aware datetime."""
@@ -37,9 +43,43 @@ class Achievement(SQLModel, table=True):
 
     id: int | None = Field(default=None, primary_key=True)
     achievement_type: AchievementType = Field(index=True, unique=True)
-    achieved_at: datetime = Field(default_factory=utc_now)
+    achieved_at: datetime = Field(
+        default_factory=utc_now,
+        sa_column_kwargs={"server_default": func.now()},
+    )
     details: str | None = Field(default=None)  # JSON with details
 
+    @classmethod
+    def bulk_upsert(cls, db: DbSession, rows: list[AchievementCreate]) -> None:
+        """Unlock many achievements in one statement.
+
+        A single multi-VALUES insert replaces the per-row add/commit
+        loop. Achievements are unlock-once (the route returns 409 on
+        duplicates), so conflicts keep the original unlock rather than
+        overwriting its timestamp.
+
+        Args:
+            db: Database session (caller commits)
+            rows: Achievements to unlock; already-unlocked types are
+                left untouched
+        """
+        if not rows:
+            return
+
+        # One timestamp shared by the whole batch — the rows are
+        # unlocked together, and per-row now() allocations add up
+        now = utc_now()
+        payload = []
+        for row in rows:
+            data = row.model_dump()
+            if data["achieved_at"] is None:
+                data["achieved_at"] = now
+            payload.append(data)
+
+        stmt = sqlite_insert(cls).values(payload)
+        stmt = stmt.on_conflict_do_nothing(index_elements=["achievement_type"])
+        db.execute(stmt)
+
 
 class AchievementCreate(SQLModel):
     """Schema for creating a new achievement."""
@@ -0,0 +1,30 @@
+"""Loop analysis cache database model."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+from sqlmodel import Field, SQLModel
+
+
+def utc_now() -> datetime:
+    """Get current UTC time as timezone-aware datetime."""
+    return datetime.now(UTC)
+
+
+class LoopAnalysis(SQLModel, table=True):
+    """Cached result of a full loop-detection analysis.
+
+    Keyed on the file content hash plus the analysis parameters, so
+    repeated analyses of the same stem are served from the database
+    instead of recomputed.
+    """
+
+    __tablename__ = "loop_analyses"  # type: ignore[assignment]
+
+    id: int | None = Field(default=None, primary_key=True)
+    file_hash: str = Field(index=True)
+    params: str  # JSON of (sr, hop_length, num_sections, ...)
+    sections_json: str  # JSON list of [start, end] pairs
+    metadata_json: str  # JSON list of per-loop metadata dicts
+    created_at: datetime = Field(default_factory=utc_now)
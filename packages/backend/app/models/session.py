@@ -1,10 +1,13 @@
 """Practice session database models."""
 
-from __future__ import annotations
-
 from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Optional
+
+from sqlalchemy import Index, func
+from sqlmodel import Field, Relationship, SQLModel
 
-from sqlmodel import Field, SQLModel
+if TYPE_CHECKING:
+    from .song import Song
 
 
 def utc_now() -> datetime:
@@ -16,10 +19,18 @@ class Session(SQLModel, table=True):
     """Practice session model."""
 
     __tablename__ = "sessions"  # type: ignore[assignment]
+    # Backs `WHERE song_id = ? ORDER BY started_at DESC LIMIT n` in
+    # list_sessions as a pure index range scan (SQLite walks the index
+    # backwards for the DESC order) instead of a scan + sort
+    __table_args__ = (Index("ix_sessions_song_id_started_at", "song_id", "started_at"),)
 
     id: int | None = Field(default=None, primary_key=True)
     song_id: int | None = Field(default=None, foreign_key="songs.id", index=True)
-    started_at: datetime = Field(default_factory=utc_now, index=True)
+    started_at: datetime = Field(
+        default_factory=utc_now,
+        index=True,
+        sa_column_kwargs={"server_default": func.now()},
+    )
     ended_at: datetime | None = Field(default=None)
     duration_seconds: int | None = Field(default=None)
     loops_practiced: int = Field(default=0)
@@ -27,6 +38,10 @@ class Session(SQLModel, table=True):
         default=None
     )  # JSON array of stem types used
 
+    # Optional[...] (not the | union) so the mapper can resolve the
+    # forward reference by name
+    song: Optional["Song"] = Relationship(back_populates="sessions")  # noqa: UP045
+
 
 class SessionCreate(SQLModel):
     """Schema for creating a new session."""
@@ -1,10 +1,14 @@
 """Song database model."""
 
-from __future__ import annotations
-
 from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import func
+from sqlmodel import Field, Relationship, SQLModel
 
-from sqlmodel import Field, SQLModel
+if TYPE_CHECKING:
+    from .session import Session
+    from .stem import Stem
 
 
 def utc_now() -> datetime:
@@ -20,12 +24,34 @@ class Song(SQLModel, table=True):
     id: int | None = Field(default=None, primary_key=True)
     title: str = Field(index=True)
     artist: str | None = Field(default=None)
-    file_path: str = Field(unique=True)
+    # file_hash is the identity lookups go through (the cache-key
+    # path); content-identical files imported under two paths are the
+    # same song, so a unique index on file_path only added a second
+    # unique check per insert. A plain index keeps path lookups fast.
+    # No extra covering index is needed: SQLite stores the rowid (id)
+    # in every index entry, so hash-to-id resolution is already an
+    # index-only scan on the unique file_hash index.
+    file_path: str = Field(index=True)
     file_hash: str = Field(unique=True, index=True)
     duration_seconds: float | None = Field(default=None)
-    created_at: datetime = Field(default_factory=utc_now)
+    # server_default lets raw SQL and bulk inserts omit the column and
+    # have the database stamp it, instead of one tzaware allocation per
+    # row in Python; ORM inserts still use the Python factory
+    created_at: datetime = Field(
+        default_factory=utc_now,
+        sa_column_kwargs={"server_default": func.now()},
+    )
     processed_at: datetime | None = Field(default=None)
 
+    # selectin loading batches children into one IN (...) query per
+    # collection instead of a lazy SELECT per parent row (N+1)
+    stems: list["Stem"] = Relationship(
+        back_populates="song", sa_relationship_kwargs={"lazy": "selectin"}
+    )
+    sessions: list["Session"] = Relationship(
+        back_populates="song", sa_relationship_kwargs={"lazy": "selectin"}
+    )
+
 
 class SongCreate(SQLModel):
     """Schema for creating a new song."""
@@ -1,11 +1,14 @@
 """Stem database model."""
 
-from __future__ import annotations
-
 from datetime import UTC, datetime
 from enum import Enum
+from typing import TYPE_CHECKING, Optional
+
+from sqlalchemy import func
+from sqlmodel import Field, Relationship, SQLModel
 
-from sqlmodel import Field, SQLModel
+if TYPE_CHECKING:
+    from .song import Song
 
 
 def utc_now() -> datetime:
@@ -31,7 +34,14 @@ class Stem(SQLModel, table=True):
     song_id: int = Field(foreign_key="songs.id", index=True)
     stem_type: StemType = Field(index=True)
     file_path: str
-    created_at: datetime = Field(default_factory=utc_now)
+    created_at: datetime = Field(
+        default_factory=utc_now,
+        sa_column_kwargs={"server_default": func.now()},
+    )
+
+    # Optional[...] (not the | union) so the mapper can resolve the
+    # forward reference by name
+    song: Optional["Song"] = Relationship(back_populates="stems")  # noqa: UP045
 
 
 class StemCreate(SQLModel):
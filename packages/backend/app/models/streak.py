@@ -3,9 +3,26 @@
 from __future__ import annotations
 
 from datetime import date as Date
+from typing import TYPE_CHECKING
 
-from sqlalchemy import JSON, Column
-from sqlmodel import Field, SQLModel
+from sqlalchemy import JSON, Column, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Field, SQLModel, select
+
+if TYPE_CHECKING:
+    from sqlmodel import Session as DbSession
+
+# Merges the existing and incoming songs_practiced JSON arrays
+# server-side; UNION deduplicates and ORDER BY keeps the merged array
+# deterministic regardless of insert order, so repeated reads of the
+# same state produce byte-identical JSON. Shared by the single-row
+# upsert in the streak routes and bulk_upsert below.
+SONGS_MERGE = text(
+    "(SELECT json_group_array(value) FROM ("
+    "SELECT value FROM json_each(streaks.songs_practiced) "
+    "UNION SELECT value FROM json_each(excluded.songs_practiced) "
+    "ORDER BY value))"
+)
 
 
 class Streak(SQLModel, table=True):
@@ -20,6 +37,63 @@ class Streak(SQLModel, table=True):
     )
     session_count: int = Field(default=0)
 
+    @classmethod
+    def bulk_upsert(cls, db: DbSession, rows: list[StreakCreate]) -> None:
+        """Insert or accumulate many daily rollups in one statement.
+
+        One multi-VALUES upsert replaces the per-row add/commit loop —
+        a single round trip regardless of batch size. Conflicting days
+        accumulate exactly like the single-row route upsert: times and
+        session counts add up, song lists merge deduplicated.
+
+        Args:
+            db: Database session (caller commits)
+            rows: Daily rollups to insert or fold in
+        """
+        if not rows:
+            return
+
+        stmt = sqlite_insert(cls).values([r.model_dump() for r in rows])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["date"],
+            set_={
+                "practice_time_seconds": cls.practice_time_seconds
+                + stmt.excluded.practice_time_seconds,
+                "songs_practiced": SONGS_MERGE,
+                "session_count": cls.session_count + stmt.excluded.session_count,
+            },
+        )
+        db.execute(stmt)
+
+    @classmethod
+    def practiced_song(cls, db: DbSession, day: Date, song: str) -> bool:
+        """Check whether a song appears in a day's practice list.
+
+        The containment test runs inside SQLite via json_each against
+        the primary-key row, so no songs_practiced array is fetched and
+        decoded in Python.
+
+        Args:
+            db: Database session
+            day: Day to check
+            song: Song identifier to look for
+
+        Returns:
+            True if the song was practiced that day
+        """
+        stmt = (
+            select(cls.date)
+            .where(cls.date == day)
+            .where(
+                text(
+                    "EXISTS (SELECT 1 FROM "
+                    "json_each(streaks.songs_practiced) "
+                    "WHERE value = :song)"
+                ).bindparams(song=song)
+            )
+        )
+        return db.exec(stmt).first() is not None
+
 
 class StreakCreate(SQLModel):
     """Schema for creating a new streak record."""
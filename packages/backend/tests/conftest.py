@@ -10,34 +10,76 @@ sys.modules["demucs.api"] = MagicMock()
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlmodel import Session, SQLModel, create_engine
 from sqlmodel.pool import StaticPool
 
+from app.api import streak_routes
 from app.database import get_session
-from app.main import app
+from app.main import app, fastapi_app
 
 
-@pytest.fixture(name="test_db_session")
-def test_db_session_fixture():
-    """Create in-memory SQLite database for testing."""
+@pytest.fixture(scope="session")
+def test_engine():
+    """Create the in-memory SQLite engine and schema once per run.
+
+    Rebuilding the engine and replaying the DDL for an identical
+    schema per test is pure overhead; per-test isolation comes from
+    the transaction rollback in test_db_session instead.
+    """
     engine = create_engine(
         "sqlite://",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
+
+    # pysqlite's implicit transaction handling breaks SAVEPOINT, which
+    # the rollback isolation below depends on; disable it and emit
+    # BEGIN ourselves (the workaround from the SQLAlchemy sqlite docs)
+    @event.listens_for(engine, "connect")
+    def _disable_implicit_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     SQLModel.metadata.create_all(engine)
-    with Session(engine) as session:
+    return engine
+
+
+@pytest.fixture(name="test_db_session")
+def test_db_session_fixture(test_engine):
+    """Yield a session wrapped in a transaction rolled back per test."""
+    connection = test_engine.connect()
+    transaction = connection.begin()
+    # Savepoints let route code commit freely while the outer
+    # transaction still rolls everything back at teardown
+    with Session(
+        connection, join_transaction_mode="create_savepoint"
+    ) as session:
         yield session
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture(scope="session")
+def shared_client():
+    """Build the TestClient (httpx transport + ASGI wiring) once per run."""
+    return TestClient(app)
 
 
 @pytest.fixture(name="client")
-def client_fixture(test_db_session: Session):
-    """Create FastAPI test client with test database."""
+def client_fixture(shared_client: TestClient, test_db_session: Session):
+    """Point the shared test client at this test's database."""
 
     def get_session_override():
         return test_db_session
 
-    app.dependency_overrides[get_session] = get_session_override
-    client = TestClient(app)
-    yield client
-    app.dependency_overrides.clear()
+    # Overrides live on the FastAPI instance; `app` is the ASGI wrapper
+    fastapi_app.dependency_overrides[get_session] = get_session_override
+    # The response cache is process-global; reset it so cached bodies from
+    # one test's database never leak into the next
+    streak_routes._response_cache.clear()
+    yield shared_client
+    fastapi_app.dependency_overrides.clear()
@@ -1,8 +1,19 @@
 """Tests for streak tracking API endpoints."""
 
-from datetime import date, timedelta
+from datetime import UTC, date, datetime, timedelta
 
 import pytest
+from sqlmodel import select
+
+from app.api.streak_routes import update_streak
+from app.models import Achievement, AchievementType, Session, Streak, StreakUpdate
+from app.models.achievement import AchievementCreate
+from app.models.streak import StreakCreate
+
+# List/filter tests seed their rows directly through the shared
+# test_db_session instead of per-row POSTs — the HTTP create path is
+# covered by its own tests, and skipping routing/validation for setup
+# keeps these tests about the read endpoints they assert.
 
 
 # ========================================
@@ -10,42 +21,36 @@ import pytest
 # ========================================
 
 
-def test_create_session_minimal(client):
-    """Test creating practice session with minimal data."""
-    session_data = {
-        "duration_seconds": 1800,  # 30 minutes
-    }
-
-    response = client.post("/api/sessions", json=session_data)
+@pytest.mark.parametrize(
+    ("payload", "expected"),
+    [
+        # Minimal data (30 minutes)
+        ({"duration_seconds": 1800}, {"duration_seconds": 1800, "song_id": None}),
+        # All fields
+        (
+            {"duration_seconds": 3600, "loops_practiced": 5},
+            {"duration_seconds": 3600, "loops_practiced": 5},
+        ),
+    ],
+)
+def test_create_session(client, payload, expected):
+    """Test creating practice sessions with minimal and full payloads."""
+    response = client.post("/api/sessions", json=payload)
 
     assert response.status_code == 201
     data = response.json()
-    assert data["duration_seconds"] == 1800
-    assert data["song_id"] is None
+    for key, value in expected.items():
+        assert data[key] == value
     assert "id" in data
     assert "started_at" in data
 
 
-def test_create_session_full(client):
-    """Test creating practice session with all fields."""
-    session_data = {
-        "duration_seconds": 3600,
-        "loops_practiced": 5,
-    }
-
-    response = client.post("/api/sessions", json=session_data)
-
-    assert response.status_code == 201
-    data = response.json()
-    assert data["duration_seconds"] == 3600
-    assert data["loops_practiced"] == 5
-
-
+# Note: Currently no validation for negative duration in the model.
+# This test documents expected future behavior. Decorator-level skip so
+# pytest never resolves the client fixture for it.
+@pytest.mark.skip(reason="Duration validation not yet implemented")
 def test_create_session_invalid_duration(client):
     """Test creating session with negative duration."""
-    # Note: Currently no validation for negative duration in the model
-    # This test documents expected future behavior
-    pytest.skip("Duration validation not yet implemented")
 
 
 def test_get_sessions_empty(client):
@@ -56,14 +61,19 @@ def test_get_sessions_empty(client):
     assert response.json() == []
 
 
-def test_get_sessions_list(client):
+def test_get_sessions_list(client, test_db_session):
     """Test getting list of sessions."""
-    # Create 3 sessions
-    for i in range(3):
-        client.post(
-            "/api/sessions",
-            json={"duration_seconds": 600 + i * 100},
+    # Seed 3 sessions with explicit timestamps so the DESC ordering
+    # assertion doesn't depend on sub-second insert timing
+    now = datetime.now(UTC)
+    test_db_session.add_all(
+        Session(
+            duration_seconds=600 + i * 100,
+            started_at=now + timedelta(seconds=i),
         )
+        for i in range(3)
+    )
+    test_db_session.commit()
 
     response = client.get("/api/sessions")
 
@@ -76,18 +86,18 @@ def test_get_sessions_list(client):
     assert data[2]["duration_seconds"] == 600
 
 
+# Note: This test requires actual song IDs from the songs table;
+# skipped at the decorator so no fixtures are built for it
+@pytest.mark.skip(reason="Requires song fixtures")
 def test_get_sessions_filter_by_song(client):
     """Test filtering sessions by song_id."""
-    # Note: This test requires actual song IDs from the songs table
-    # Skipping for now as we don't have song fixtures set up
-    pytest.skip("Requires song fixtures")
 
 
-def test_get_sessions_limit(client):
+def test_get_sessions_limit(client, test_db_session):
     """Test limit parameter for sessions."""
-    # Create 5 sessions
-    for i in range(5):
-        client.post("/api/sessions", json={"duration_seconds": 600})
+    # Seed 5 sessions
+    test_db_session.add_all(Session(duration_seconds=600) for _ in range(5))
+    test_db_session.commit()
 
     response = client.get("/api/sessions?limit=3")
 
@@ -96,6 +106,27 @@ def test_get_sessions_limit(client):
     assert len(data) == 3
 
 
+def test_create_sessions_bulk(client):
+    """Test bulk session creation inserts all rows in one request."""
+    payload = [{"duration_seconds": 600 + i * 100} for i in range(3)]
+
+    response = client.post("/api/sessions/bulk", json=payload)
+
+    assert response.status_code == 201
+    assert response.json() == {"created": 3}
+
+    sessions = client.get("/api/sessions").json()
+    assert len(sessions) == 3
+
+
+def test_create_sessions_bulk_empty(client):
+    """Test bulk session creation with an empty batch."""
+    response = client.post("/api/sessions/bulk", json=[])
+
+    assert response.status_code == 201
+    assert response.json() == {"created": 0}
+
+
 # ========================================
 # Streak Tests
 # ========================================
@@ -140,66 +171,64 @@ def test_update_streak_create_new(client):
     assert set(data["songs_practiced"]) == {"song-1", "song-2"}
 
 
-def test_update_streak_incremental(client):
+def test_update_streak_incremental(test_db_session):
     """Test updating streak increments values."""
     today = date.today()
 
-    # First update
-    client.patch(
-        f"/api/streaks/{today}",
-        json={
-            "practice_time_seconds": 1800,
-            "songs_practiced": ["song-1"],
-        },
+    # The accumulation logic lives in the upsert, so exercise the route
+    # function directly; the HTTP envelope is covered by the create test
+    update_streak(
+        db=test_db_session,
+        streak_date=today,
+        streak_update=StreakUpdate(
+            practice_time_seconds=1800, songs_practiced=["song-1"]
+        ),
     )
 
     # Second update (should add to existing)
-    response = client.patch(
-        f"/api/streaks/{today}",
-        json={
-            "practice_time_seconds": 1200,
-            "songs_practiced": ["song-2"],
-        },
+    streak = update_streak(
+        db=test_db_session,
+        streak_date=today,
+        streak_update=StreakUpdate(
+            practice_time_seconds=1200, songs_practiced=["song-2"]
+        ),
     )
 
-    assert response.status_code == 200
-    data = response.json()
-    assert data["practice_time_seconds"] == 3000  # 1800 + 1200
-    assert data["session_count"] == 2  # Incremented twice
-    assert set(data["songs_practiced"]) == {"song-1", "song-2"}
+    assert streak.practice_time_seconds == 3000  # 1800 + 1200
+    assert streak.session_count == 2  # Incremented twice
+    assert set(streak.songs_practiced) == {"song-1", "song-2"}
 
 
-def test_update_streak_duplicate_songs(client):
+def test_update_streak_duplicate_songs(test_db_session):
     """Test updating streak deduplicates songs."""
     today = date.today()
 
-    client.patch(
-        f"/api/streaks/{today}",
-        json={"songs_practiced": ["song-1", "song-2"]},
+    update_streak(
+        db=test_db_session,
+        streak_date=today,
+        streak_update=StreakUpdate(songs_practiced=["song-1", "song-2"]),
     )
 
-    response = client.patch(
-        f"/api/streaks/{today}",
-        json={"songs_practiced": ["song-2", "song-3"]},
+    streak = update_streak(
+        db=test_db_session,
+        streak_date=today,
+        streak_update=StreakUpdate(songs_practiced=["song-2", "song-3"]),
     )
 
-    assert response.status_code == 200
-    data = response.json()
     # Should have unique songs only
-    assert set(data["songs_practiced"]) == {"song-1", "song-2", "song-3"}
+    assert set(streak.songs_practiced) == {"song-1", "song-2", "song-3"}
 
 
-def test_get_streaks_list(client):
+def test_get_streaks_list(client, test_db_session):
     """Test getting list of streaks."""
     today = date.today()
 
-    # Create streaks for last 3 days
-    for i in range(3):
-        day = today - timedelta(days=i)
-        client.patch(
-            f"/api/streaks/{day}",
-            json={"practice_time_seconds": 1800},
-        )
+    # Seed streaks for last 3 days
+    test_db_session.add_all(
+        Streak(date=today - timedelta(days=i), practice_time_seconds=1800)
+        for i in range(3)
+    )
+    test_db_session.commit()
 
     response = client.get("/api/streaks")
 
@@ -212,17 +241,16 @@ def test_get_streaks_list(client):
     assert data[2]["date"] == str(today - timedelta(days=2))
 
 
-def test_get_streaks_since_date(client):
+def test_get_streaks_since_date(client, test_db_session):
     """Test filtering streaks by date."""
     today = date.today()
 
-    # Create streaks for last 5 days
-    for i in range(5):
-        day = today - timedelta(days=i)
-        client.patch(
-            f"/api/streaks/{day}",
-            json={"practice_time_seconds": 1800},
-        )
+    # Seed streaks for last 5 days
+    test_db_session.add_all(
+        Streak(date=today - timedelta(days=i), practice_time_seconds=1800)
+        for i in range(5)
+    )
+    test_db_session.commit()
 
     # Get only last 3 days
     since_date = today - timedelta(days=2)
@@ -233,17 +261,16 @@ def test_get_streaks_since_date(client):
     assert len(data) == 3
 
 
-def test_get_streaks_limit(client):
+def test_get_streaks_limit(client, test_db_session):
     """Test limit parameter for streaks."""
     today = date.today()
 
-    # Create 5 days of streaks
-    for i in range(5):
-        day = today - timedelta(days=i)
-        client.patch(
-            f"/api/streaks/{day}",
-            json={"practice_time_seconds": 1800},
-        )
+    # Seed 5 days of streaks
+    test_db_session.add_all(
+        Streak(date=today - timedelta(days=i), practice_time_seconds=1800)
+        for i in range(5)
+    )
+    test_db_session.commit()
 
     response = client.get("/api/streaks?limit=3")
 
@@ -295,17 +322,18 @@ def test_unlock_achievement_duplicate(client):
     assert "already unlocked" in response2.json()["detail"]
 
 
-def test_get_achievements_list(client):
+def test_get_achievements_list(client, test_db_session):
     """Test getting list of unlocked achievements."""
-    # Unlock 3 achievements
-    achievements = [
-        {"achievement_type": "streak_7"},
-        {"achievement_type": "streak_30"},
-        {"achievement_type": "songs_10"},
-    ]
-
-    for ach in achievements:
-        client.post("/api/achievements", json=ach)
+    # Seed 3 unlocked achievements
+    test_db_session.add_all(
+        Achievement(achievement_type=achievement_type)
+        for achievement_type in (
+            AchievementType.STREAK_7,
+            AchievementType.STREAK_30,
+            AchievementType.SONGS_10,
+        )
+    )
+    test_db_session.commit()
 
     response = client.get("/api/achievements")
 
@@ -316,6 +344,205 @@ def test_get_achievements_list(client):
     assert types == {"streak_7", "streak_30", "songs_10"}
 
 
+# ========================================
+# Model Bulk Upsert Tests
+# ========================================
+
+
+def test_streak_bulk_upsert_inserts(test_db_session):
+    """Test bulk upsert inserts new days in one statement."""
+    today = date.today()
+    Streak.bulk_upsert(
+        test_db_session,
+        [
+            StreakCreate(
+                date=today - timedelta(days=i),
+                practice_time_seconds=600 + i * 100,
+                songs_practiced=[f"song-{i}"],
+                session_count=1,
+            )
+            for i in range(3)
+        ],
+    )
+    test_db_session.commit()
+
+    for i in range(3):
+        streak = test_db_session.get(Streak, today - timedelta(days=i))
+        assert streak is not None
+        assert streak.practice_time_seconds == 600 + i * 100
+        assert streak.songs_practiced == [f"song-{i}"]
+
+
+def test_streak_bulk_upsert_accumulates(test_db_session):
+    """Test conflicting days accumulate like the single-row upsert."""
+    today = date.today()
+    test_db_session.add(
+        Streak(
+            date=today,
+            practice_time_seconds=1800,
+            songs_practiced=["song-1", "song-2"],
+            session_count=1,
+        )
+    )
+    test_db_session.commit()
+
+    Streak.bulk_upsert(
+        test_db_session,
+        [
+            StreakCreate(
+                date=today,
+                practice_time_seconds=1200,
+                songs_practiced=["song-2", "song-3"],
+                session_count=1,
+            )
+        ],
+    )
+    test_db_session.commit()
+    test_db_session.expire_all()
+
+    streak = test_db_session.get(Streak, today)
+    assert streak.practice_time_seconds == 3000
+    assert streak.session_count == 2
+    # Merged, deduplicated, and deterministically ordered
+    assert streak.songs_practiced == ["song-1", "song-2", "song-3"]
+
+
+def test_streak_bulk_upsert_same_day_twice_in_batch(test_db_session):
+    """Test two rows for the same day in one batch both fold in."""
+    today = date.today()
+    Streak.bulk_upsert(
+        test_db_session,
+        [
+            StreakCreate(
+                date=today,
+                practice_time_seconds=600,
+                songs_practiced=["song-1"],
+                session_count=1,
+            ),
+            StreakCreate(
+                date=today,
+                practice_time_seconds=900,
+                songs_practiced=["song-1", "song-2"],
+                session_count=1,
+            ),
+        ],
+    )
+    test_db_session.commit()
+    test_db_session.expire_all()
+
+    streak = test_db_session.get(Streak, today)
+    assert streak.practice_time_seconds == 1500
+    assert streak.session_count == 2
+    assert streak.songs_practiced == ["song-1", "song-2"]
+
+
+def test_streak_bulk_upsert_empty_song_lists(test_db_session):
+    """Test merging empty song lists stays an empty list."""
+    today = date.today()
+    Streak.bulk_upsert(
+        test_db_session, [StreakCreate(date=today, practice_time_seconds=600)]
+    )
+    Streak.bulk_upsert(
+        test_db_session, [StreakCreate(date=today, practice_time_seconds=600)]
+    )
+    test_db_session.commit()
+    test_db_session.expire_all()
+
+    streak = test_db_session.get(Streak, today)
+    assert streak.practice_time_seconds == 1200
+    assert streak.songs_practiced == []
+
+
+def test_streak_bulk_upsert_empty_batch(test_db_session):
+    """Test bulk upsert with no rows is a no-op."""
+    Streak.bulk_upsert(test_db_session, [])
+    test_db_session.commit()
+
+
+def test_achievement_bulk_upsert_inserts(test_db_session):
+    """Test bulk unlock inserts all new achievements."""
+    Achievement.bulk_upsert(
+        test_db_session,
+        [
+            AchievementCreate(achievement_type=AchievementType.STREAK_7),
+            AchievementCreate(achievement_type=AchievementType.SONGS_10),
+        ],
+    )
+    test_db_session.commit()
+
+    achievements = test_db_session.exec(select(Achievement)).all()
+    assert {a.achievement_type for a in achievements} == {
+        AchievementType.STREAK_7,
+        AchievementType.SONGS_10,
+    }
+    assert all(a.achieved_at is not None for a in achievements)
+
+
+def test_achievement_bulk_upsert_keeps_original_unlock(test_db_session):
+    """Test re-unlocking keeps the original row untouched."""
+    original = Achievement(
+        achievement_type=AchievementType.STREAK_7,
+        achieved_at=datetime.now(UTC) - timedelta(days=1),
+    )
+    test_db_session.add(original)
+    test_db_session.commit()
+    first_unlock = original.achieved_at
+
+    Achievement.bulk_upsert(
+        test_db_session,
+        [AchievementCreate(achievement_type=AchievementType.STREAK_7)],
+    )
+    test_db_session.commit()
+    test_db_session.expire_all()
+
+    achievements = test_db_session.exec(select(Achievement)).all()
+    assert len(achievements) == 1
+    assert achievements[0].achieved_at == first_unlock
+
+
+def test_achievement_bulk_upsert_empty_batch(test_db_session):
+    """Test bulk unlock with no rows is a no-op."""
+    Achievement.bulk_upsert(test_db_session, [])
+    test_db_session.commit()
+
+
+# ========================================
+# Practiced-Song Query Tests
+# ========================================
+
+
+def test_practiced_song_present(test_db_session):
+    """Test containment query finds a practiced song."""
+    today = date.today()
+    test_db_session.add(Streak(date=today, songs_practiced=["song-1", "song-2"]))
+    test_db_session.commit()
+
+    assert Streak.practiced_song(test_db_session, today, "song-2") is True
+
+
+def test_practiced_song_absent(test_db_session):
+    """Test containment query rejects an unpracticed song."""
+    today = date.today()
+    test_db_session.add(Streak(date=today, songs_practiced=["song-1"]))
+    test_db_session.commit()
+
+    assert Streak.practiced_song(test_db_session, today, "song-9") is False
+
+
+def test_practiced_song_empty_list(test_db_session):
+    """Test containment query against an empty practice list."""
+    today = date.today()
+    test_db_session.add(Streak(date=today, songs_practiced=[]))
+    test_db_session.commit()
+
+    assert Streak.practiced_song(test_db_session, today, "song-1") is False
+
+
+def test_practiced_song_no_row(test_db_session):
+    """Test containment query for a day with no streak row."""
+    assert Streak.practiced_song(test_db_session, date.today(), "song-1") is False
+
+
 # ========================================
 # Integration Tests
 # ========================================
@@ -369,20 +596,22 @@ def test_practice_workflow(client):
 
 
 @pytest.mark.integration
-def test_multi_day_streak(client):
+def test_multi_day_streak(client, test_db_session):
     """Test practice streak across multiple days."""
     today = date.today()
 
-    # Practice for 7 consecutive days
-    for i in range(7):
-        day = today - timedelta(days=i)
-        client.patch(
-            f"/api/streaks/{day}",
-            json={
-                "practice_time_seconds": 1800,
-                "songs_practiced": [f"song-{i}"],
-            },
+    # Seed 7 consecutive days of practice in one transaction; the PATCH
+    # accumulation semantics have their own tests above
+    test_db_session.add_all(
+        Streak(
+            date=today - timedelta(days=i),
+            practice_time_seconds=1800,
+            songs_practiced=[f"song-{i}"],
+            session_count=1,
         )
+        for i in range(7)
+    )
+    test_db_session.commit()
 
     # Get all streaks
     response = client.get("/api/streaks?limit=10")
@@ -1,13 +1,45 @@
 """Tests for WebSocket connection handling."""
 import asyncio
-from unittest.mock import AsyncMock, Mock, patch
+from unittest.mock import patch
 
+import orjson
 import pytest
 from fastapi import WebSocketDisconnect
 
 from app.api.websocket import ConnectionManager
 
 
+class _StubWebSocket:
+    """Minimal WebSocket stand-in for ConnectionManager tests.
+
+    Plain counters and lists instead of unittest.mock machinery, whose
+    AsyncMock construction and call tracking dominate these sub-ms
+    tests. Set fail_send to make send_text raise like a dropped
+    connection.
+    """
+
+    def __init__(self, fail_send: bool = False) -> None:
+        self.accepted = 0
+        self.sent: list[str] = []
+        self.fail_send = fail_send
+
+    async def accept(self) -> None:
+        self.accepted += 1
+
+    async def send_text(self, data: str) -> None:
+        if self.fail_send:
+            raise Exception("Connection lost")
+        self.sent.append(data)
+
+    async def close(self) -> None:
+        pass
+
+
+def _sent_message(ws: _StubWebSocket) -> dict:
+    """Decode the last text frame sent on a stub WebSocket."""
+    return orjson.loads(ws.sent[-1])
+
+
 class TestConnectionManager:
     """Test ConnectionManager functionality."""
 
@@ -17,36 +49,31 @@ class TestConnectionManager:
         return ConnectionManager()
 
     @pytest.fixture
-    def mock_websocket(self) -> Mock:
-        """Create a mock WebSocket."""
-        ws = Mock()
-        ws.accept = AsyncMock()
-        ws.send_json = AsyncMock()
-        ws.close = AsyncMock()
-        return ws
+    def mock_websocket(self) -> _StubWebSocket:
+        """Create a stub WebSocket."""
+        return _StubWebSocket()
 
     @pytest.mark.asyncio
     async def test_connect_new_client(
-        self, manager: ConnectionManager, mock_websocket: Mock
+        self, manager: ConnectionManager, mock_websocket: _StubWebSocket
     ) -> None:
         """Test connecting a new client."""
         await manager.connect(mock_websocket, "client-1")
 
-        assert "client-1" in manager.active_connections
-        assert manager.active_connections["client-1"] == mock_websocket
-        assert "client-1" in manager.connection_timestamps
-        mock_websocket.accept.assert_called_once()
+        assert "client-1" in manager.conns
+        assert manager.conns["client-1"].ws == mock_websocket
+        assert manager.conns["client-1"].last_seen > 0
+        assert mock_websocket.accepted == 1
 
     @pytest.mark.asyncio
     async def test_disconnect_existing_client(
-        self, manager: ConnectionManager, mock_websocket: Mock
+        self, manager: ConnectionManager, mock_websocket: _StubWebSocket
     ) -> None:
         """Test disconnecting an existing client."""
         await manager.connect(mock_websocket, "client-2")
         await manager.disconnect("client-2")
 
-        assert "client-2" not in manager.active_connections
-        assert "client-2" not in manager.connection_timestamps
+        assert "client-2" not in manager.conns
 
     @pytest.mark.asyncio
     async def test_disconnect_nonexistent_client(
@@ -55,26 +82,26 @@ class TestConnectionManager:
         """Test disconnecting a client that doesn't exist."""
         # Should not raise error
         await manager.disconnect("nonexistent-client")
-        assert "nonexistent-client" not in manager.active_connections
+        assert "nonexistent-client" not in manager.conns
 
     @pytest.mark.asyncio
     async def test_send_progress_update(
-        self, manager: ConnectionManager, mock_websocket: Mock
+        self, manager: ConnectionManager, mock_websocket: _StubWebSocket
     ) -> None:
         """Test sending progress update to client."""
         await manager.connect(mock_websocket, "client-3")
         await manager.send_progress("client-3", 50.0, "processing")
 
         # Verify WebSocket message was sent
-        mock_websocket.send_json.assert_called_once()
-        call_args = mock_websocket.send_json.call_args[0][0]
+        assert len(mock_websocket.sent) == 1
+        call_args = _sent_message(mock_websocket)
         assert call_args["type"] == "progress"
         assert call_args["data"]["progress"] == 50.0
         assert call_args["data"]["status"] == "processing"
 
     @pytest.mark.asyncio
     async def test_send_progress_with_metadata(
-        self, manager: ConnectionManager, mock_websocket: Mock
+        self, manager: ConnectionManager, mock_websocket: _StubWebSocket
     ) -> None:
         """Test sending progress with metadata."""
         await manager.connect(mock_websocket, "client-meta")
@@ -82,7 +109,7 @@ class TestConnectionManager:
 
         await manager.send_progress("client-meta", 75.0, "processing", metadata=metadata)
 
-        call_args = mock_websocket.send_json.call_args[0][0]
+        call_args = _sent_message(mock_websocket)
         assert call_args["data"]["metadata"] == metadata
 
     @pytest.mark.asyncio
@@ -95,21 +122,21 @@ class TestConnectionManager:
 
     @pytest.mark.asyncio
     async def test_send_error(
-        self, manager: ConnectionManager, mock_websocket: Mock
+        self, manager: ConnectionManager, mock_websocket: _StubWebSocket
     ) -> None:
         """Test sending error message to client."""
         await manager.connect(mock_websocket, "client-4")
         await manager.send_error("client-4", "Processing failed")
 
         # Verify WebSocket message was sent
-        mock_websocket.send_json.assert_called()
-        call_args = mock_websocket.send_json.call_args[0][0]
+        assert mock_websocket.sent
+        call_args = _sent_message(mock_websocket)
         assert call_args["type"] == "error"
         assert call_args["data"]["error"] == "Processing failed"
 
     @pytest.mark.asyncio
     async def test_send_error_with_details(
-        self, manager: ConnectionManager, mock_websocket: Mock
+        self, manager: ConnectionManager, mock_websocket: _StubWebSocket
     ) -> None:
         """Test sending error with details."""
         await manager.connect(mock_websocket, "client-err")
@@ -117,12 +144,12 @@ class TestConnectionManager:
 
         await manager.send_error("client-err", "Invalid audio file", details=details)
 
-        call_args = mock_websocket.send_json.call_args[0][0]
+        call_args = _sent_message(mock_websocket)
         assert call_args["data"]["details"] == details
 
     @pytest.mark.asyncio
     async def test_send_completion(
-        self, manager: ConnectionManager, mock_websocket: Mock
+        self, manager: ConnectionManager, mock_websocket: _StubWebSocket
     ) -> None:
         """Test sending completion message with result."""
         await manager.connect(mock_websocket, "client-5")
@@ -138,21 +165,16 @@ class TestConnectionManager:
         await manager.send_completion("client-5", result)
 
         # Verify WebSocket message was sent
-        mock_websocket.send_json.assert_called()
-        call_args = mock_websocket.send_json.call_args[0][0]
+        assert mock_websocket.sent
+        call_args = _sent_message(mock_websocket)
         assert call_args["type"] == "complete"
         assert call_args["data"] == result
 
     @pytest.mark.asyncio
     async def test_broadcast_to_all_clients(self, manager: ConnectionManager) -> None:
         """Test broadcasting message to all connected clients."""
-        ws1 = Mock()
-        ws1.accept = AsyncMock()
-        ws1.send_json = AsyncMock()
-
-        ws2 = Mock()
-        ws2.accept = AsyncMock()
-        ws2.send_json = AsyncMock()
+        ws1 = _StubWebSocket()
+        ws2 = _StubWebSocket()
 
         await manager.connect(ws1, "client-a")
         await manager.connect(ws2, "client-b")
@@ -161,21 +183,16 @@ class TestConnectionManager:
         await manager.broadcast(message)
 
         # Both clients should receive the broadcast
-        ws1.send_json.assert_called_once_with(message)
-        ws2.send_json.assert_called_once_with(message)
+        assert _sent_message(ws1) == message
+        assert _sent_message(ws2) == message
 
     @pytest.mark.asyncio
     async def test_broadcast_removes_failed_connections(
         self, manager: ConnectionManager
     ) -> None:
         """Test that broadcast removes clients with failed sends."""
-        ws1 = Mock()
-        ws1.accept = AsyncMock()
-        ws1.send_json = AsyncMock(side_effect=Exception("Connection lost"))
-
-        ws2 = Mock()
-        ws2.accept = AsyncMock()
-        ws2.send_json = AsyncMock()
+        ws1 = _StubWebSocket(fail_send=True)
+        ws2 = _StubWebSocket()
 
         await manager.connect(ws1, "client-fail")
         await manager.connect(ws2, "client-ok")
@@ -183,24 +200,64 @@ class TestConnectionManager:
         await manager.broadcast({"type": "test"})
 
         # Failed client should be disconnected
-        assert "client-fail" not in manager.active_connections
-        assert "client-ok" in manager.active_connections
+        assert "client-fail" not in manager.conns
+        assert "client-ok" in manager.conns
 
     @pytest.mark.asyncio
     async def test_websocket_send_failure_disconnects(
-        self, manager: ConnectionManager, mock_websocket: Mock
+        self, manager: ConnectionManager
     ) -> None:
         """Test handling WebSocket send failure."""
         # Simulate send failure
-        mock_websocket.send_json.side_effect = Exception("Connection lost")
+        ws = _StubWebSocket(fail_send=True)
 
-        await manager.connect(mock_websocket, "client-fail")
+        await manager.connect(ws, "client-fail")
 
         # Sending should disconnect the client
         await manager.send_progress("client-fail", 50.0, "processing")
 
         # Client should be auto-disconnected after failed send
-        assert "client-fail" not in manager.active_connections
+        assert "client-fail" not in manager.conns
+
+
+class _FakeWebSocket:
+    """Scripted WebSocket fake for endpoint tests.
+
+    receive_json replays the script (raising items that are
+    exceptions); sent messages accumulate in `sent`. Plain attribute
+    access and list appends are far cheaper than unittest.mock's
+    dynamic attribute machinery for these sub-ms tests.
+    """
+
+    def __init__(self, script: list) -> None:
+        self._script = iter(script)
+        self.sent: list[dict] = []
+
+    async def accept(self) -> None:
+        pass
+
+    async def receive_json(self) -> dict:
+        item = next(self._script)
+        if isinstance(item, BaseException):
+            raise item
+        return item
+
+    async def send_json(self, message: dict) -> None:
+        self.sent.append(message)
+
+
+class _FakeManager:
+    """Records connect/disconnect calls made by the endpoint."""
+
+    def __init__(self) -> None:
+        self.connected: list[str] = []
+        self.disconnected: list[str] = []
+
+    async def connect(self, websocket: object, client_id: str) -> None:
+        self.connected.append(client_id)
+
+    async def disconnect(self, client_id: str) -> None:
+        self.disconnected.append(client_id)
 
 
 class TestWebSocketEndpoint:
@@ -211,60 +268,38 @@ class TestWebSocketEndpoint:
         """Test WebSocket ping-pong health check."""
         from app.api.websocket import websocket_endpoint
 
-        ws_mock = Mock()
-        ws_mock.accept = AsyncMock()
-        ws_mock.receive_json = AsyncMock(
-            side_effect=[
-                {"type": "ping"},  # First message: ping
-                WebSocketDisconnect(code=1000),  # Then disconnect
-            ]
-        )
-        ws_mock.send_json = AsyncMock()
+        ws = _FakeWebSocket([{"type": "ping"}, WebSocketDisconnect(code=1000)])
 
-        manager_mock = Mock()
-        manager_mock.connect = AsyncMock()
-        manager_mock.disconnect = AsyncMock()
-
-        with patch("app.api.websocket.manager", manager_mock):
-            await websocket_endpoint(ws_mock, "test-ping")
+        with patch("app.api.websocket.manager", _FakeManager()):
+            await websocket_endpoint(ws, "test-ping")
 
         # Should respond to ping with pong
-        ws_mock.send_json.assert_called_with({"type": "pong"})
+        assert ws.sent == [{"type": "pong"}]
 
     @pytest.mark.asyncio
     async def test_websocket_handles_disconnect(self) -> None:
         """Test WebSocket disconnect handling."""
         from app.api.websocket import websocket_endpoint
 
-        ws_mock = Mock()
-        ws_mock.accept = AsyncMock()
-        ws_mock.receive_json = AsyncMock(side_effect=WebSocketDisconnect(code=1000))
-
-        manager_mock = Mock()
-        manager_mock.connect = AsyncMock()
-        manager_mock.disconnect = AsyncMock()
+        ws = _FakeWebSocket([WebSocketDisconnect(code=1000)])
+        fake_manager = _FakeManager()
 
-        with patch("app.api.websocket.manager", manager_mock):
-            await websocket_endpoint(ws_mock, "test-disconnect")
+        with patch("app.api.websocket.manager", fake_manager):
+            await websocket_endpoint(ws, "test-disconnect")
 
         # Verify disconnect was called
-        manager_mock.disconnect.assert_called_once_with("test-disconnect")
+        assert fake_manager.disconnected == ["test-disconnect"]
 
     @pytest.mark.asyncio
     async def test_websocket_handles_error(self) -> None:
         """Test WebSocket error handling."""
         from app.api.websocket import websocket_endpoint
 
-        ws_mock = Mock()
-        ws_mock.accept = AsyncMock()
-        ws_mock.receive_json = AsyncMock(side_effect=RuntimeError("Test error"))
-
-        manager_mock = Mock()
-        manager_mock.connect = AsyncMock()
-        manager_mock.disconnect = AsyncMock()
+        ws = _FakeWebSocket([RuntimeError("Test error")])
+        fake_manager = _FakeManager()
 
-        with patch("app.api.websocket.manager", manager_mock):
-            await websocket_endpoint(ws_mock, "test-error")
+        with patch("app.api.websocket.manager", fake_manager):
+            await websocket_endpoint(ws, "test-error")
 
         # Should disconnect on error
-        manager_mock.disconnect.assert_called_once_with("test-error")
+        assert fake_manager.disconnected == ["test-error"]
@@ -12,61 +12,88 @@ Output: test-audio.mp3 (~50KB, processes quickly in tests)
 """
 
 import numpy as np
-import sys
 
 try:
     import soundfile as sf
 except ImportError:
-    print("soundfile not installed. Installing...")
-    import subprocess
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "soundfile"])
-    import soundfile as sf
+    # Fail fast instead of pip-installing into whatever environment
+    # happens to be running the script
+    raise SystemExit(
+        "soundfile is not installed. Install it first: pip install soundfile"
+    )
 
 # Audio parameters
 SAMPLE_RATE = 44100
 DURATION = 3.0  # 3 seconds - short enough for fast tests
 NUM_SAMPLES = int(SAMPLE_RATE * DURATION)
 
-# Generate time array
-t = np.linspace(0, DURATION, NUM_SAMPLES)
+# Generate time array. float32 end to end: the file is written as
+# 16-bit PCM anyway, and every np.sin below follows this dtype, halving
+# the working set versus default float64
+t = np.linspace(0, DURATION, NUM_SAMPLES, dtype=np.float32)
+
+# All constant-frequency tones in one stacked np.sin pass over a
+# (5, N) phase matrix — same FLOPs as five separate calls, but one
+# traversal and (with out=) no extra allocation
+TONE_FREQS = np.array([100, 80, 200, 250, 300], dtype=np.float32)[:, None]
+phases = (2 * np.float32(np.pi)) * TONE_FREQS * t[None, :]
+tones = np.sin(phases, out=phases)
 
 # Generate components for each "stem"
 # Drums: Kick drum pattern (pulsing 100Hz)
-kick_pattern = np.sin(2 * np.pi * 100 * t)
+kick_pattern = tones[0]
+# 6 kicks over 3 seconds (2 per second), each a 100ms decay: one decay
+# curve scattered to every kick position in a single fancy-indexed
+# assignment instead of a Python loop with per-kick linspace/exp
+decay = np.exp(-10 * np.linspace(0, 0.1, int(SAMPLE_RATE * 0.1), dtype=np.float32))
+kick_starts = (np.arange(6) * SAMPLE_RATE * 0.5).astype(int)
+kick_starts = kick_starts[kick_starts + decay.size < NUM_SAMPLES]
 kick_envelope = np.zeros_like(t)
-for i in range(6):  # 6 kicks over 3 seconds (2 per second)
-    start = int(i * SAMPLE_RATE * 0.5)
-    end = start + int(SAMPLE_RATE * 0.1)  # 100ms kick
-    if end < NUM_SAMPLES:
-        kick_envelope[start:end] = np.exp(-10 * np.linspace(0, 0.1, end - start))
-drums = kick_pattern * kick_envelope * 0.3
+kick_envelope[kick_starts[:, None] + np.arange(decay.size)] = decay
+# In-place from here down: the tone rows and envelope are scratch
+# buffers once the stems are formed, so scaling them in place avoids a
+# full-length temporary per operation
+drums = kick_envelope
+drums *= kick_pattern
+drums *= 0.3
 
 # Bass: Simple bass note (80Hz)
-bass = np.sin(2 * np.pi * 80 * t) * 0.25
-
-# Other: Guitar-like chord (multiple frequencies)
-other = (
-    np.sin(2 * np.pi * 200 * t) +
-    np.sin(2 * np.pi * 250 * t) +
-    np.sin(2 * np.pi * 300 * t)
-) * 0.15
-
-# Vocals: Mid-range melody (varying frequency)
-vocal_freq = 400 + 50 * np.sin(2 * np.pi * 2 * t)  # Frequency modulation
-vocals = np.sin(2 * np.pi * vocal_freq * t) * 0.2
-
-# Mix all stems together
-mix = drums + bass + other + vocals
+bass = tones[1]
+bass *= 0.25
+
+# Other: Guitar-like chord (200Hz + 250Hz + 300Hz)
+other = tones[2:].sum(axis=0)
+other *= 0.15
+
+# Vocals: Mid-range melody (varying frequency), built in one buffer:
+# modulator -> instantaneous frequency -> phase -> sine -> gain
+vocals = np.sin((2 * np.pi * 2) * t)  # Frequency modulation
+vocals *= 50
+vocals += 400
+vocals *= t
+vocals *= 2 * np.float32(np.pi)
+np.sin(vocals, out=vocals)
+vocals *= 0.2
+
+# Mix all stems together in place — drums isn't reused afterwards, so
+# accumulating into it avoids three intermediate full-length arrays
+mix = drums
+mix += bass
+mix += other
+mix += vocals
 
 # Normalize to prevent clipping
-mix = mix / np.max(np.abs(mix)) * 0.9
+mix *= 0.9 / np.max(np.abs(mix))
 
-# Convert to stereo (duplicate mono channel)
-stereo_mix = np.column_stack([mix, mix])
+# Quantize to 16-bit once and duplicate the mono channel as a
+# zero-copy broadcast view instead of column_stack'ing a float copy;
+# soundfile accepts the strided input and writes int16 through as-is
+mix_i16 = (mix * 32767).astype(np.int16)
+stereo_mix = np.broadcast_to(mix_i16[:, None], (NUM_SAMPLES, 2))
 
 # Save as WAV first (soundfile doesn't support MP3 directly)
 wav_path = "test-audio.wav"
-sf.write(wav_path, stereo_mix, SAMPLE_RATE)
+sf.write(wav_path, stereo_mix, SAMPLE_RATE, subtype="PCM_16")
 
 print(f"✓ Generated {wav_path}")
 print(f"  Duration: {DURATION}s")
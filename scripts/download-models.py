@@ -21,6 +21,41 @@ def check_dependencies():
         sys.exit(1)
 
 
+def make_session_downloader():
+    """Build a download_url_to_file replacement using one keep-alive session.
+
+    htdemucs_ft is several checkpoint files from the same host;
+    torch.hub's urllib path opens a fresh TCP+TLS connection for each
+    one, while a single requests.Session reuses the connection.
+    Preserves torch.hub's hash verification and write-to-temp-then-move
+    behavior.
+    """
+    import hashlib
+    import shutil
+    import tempfile
+
+    import requests
+
+    session = requests.Session()
+
+    def download_url_to_file(url, dst, hash_prefix=None, progress=True):
+        sha256 = hashlib.sha256() if hash_prefix is not None else None
+        with tempfile.NamedTemporaryFile(dir=Path(dst).parent, delete=False) as f:
+            tmp_path = f.name
+            with session.get(url, stream=True, timeout=60) as response:
+                response.raise_for_status()
+                for chunk in response.iter_content(chunk_size=1 << 20):
+                    f.write(chunk)
+                    if sha256 is not None:
+                        sha256.update(chunk)
+        if sha256 is not None and not sha256.hexdigest().startswith(hash_prefix):
+            Path(tmp_path).unlink()
+            raise RuntimeError(f"Invalid hash value for {url}")
+        shutil.move(tmp_path, dst)
+
+    return download_url_to_file
+
+
 def download_demucs_model():
     """Download Demucs htdemucs_ft model."""
     print("[INFO] Downloading Demucs model (htdemucs_ft)...")
@@ -31,6 +66,12 @@ def download_demucs_model():
         from demucs.pretrained import get_model
         import torch
 
+        # Reuse one connection across the checkpoint files
+        try:
+            torch.hub.download_url_to_file = make_session_downloader()
+        except ImportError:
+            pass  # requests unavailable; per-file connections still work
+
         # Download the fine-tuned model
         # This will cache it in ~/.cache/torch/hub/checkpoints/
         model = get_model("htdemucs_ft")
@@ -41,27 +82,27 @@ def download_demucs_model():
         print(f"     Parameters: {total_params:,}")
         print("     Cache location: ~/.cache/torch/hub/checkpoints/")
 
-        # Clean up
-        del model
-        if torch.cuda.is_available():
-            torch.cuda.empty_cache()
-
-        return True
+        return model
 
     except Exception as e:
         print(f"[ERROR] Failed to download model: {e}")
-        return False
+        return None
 
 
-def verify_model():
-    """Verify model is accessible."""
+def verify_model(model):
+    """Verify the already-loaded model instead of re-reading the checkpoint."""
     try:
-        from demucs.pretrained import get_model
+        import torch
 
-        # Quick check that model loads
-        model = get_model("htdemucs_ft")
+        # Sanity-check the weights that are already in memory
+        if sum(p.numel() for p in model.parameters()) == 0:
+            raise ValueError("model has no parameters")
         print("[OK] Model verification successful")
+
+        # Clean up
         del model
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
         return True
 
     except Exception as e:
@@ -79,13 +120,14 @@ def main():
     check_dependencies()
 
     # Download model
-    if not download_demucs_model():
+    model = download_demucs_model()
+    if model is None:
         sys.exit(1)
 
     print()
 
-    # Verify
-    if not verify_model():
+    # Verify the in-memory model; no second checkpoint load
+    if not verify_model(model):
         print("[WARN] Model verification failed")
         print("       Model may still work, but recommend re-running this script")
 